@@ -0,0 +1,125 @@
+"""
+TITAN MICRO-BENCHMARKS
+Run: python bench.py [name ...]   (no names = run everything)
+Importing app performs the normal startup (DB pool, tables, fonts).
+"""
+import json
+import random
+import string
+import sys
+import time
+
+import app
+
+
+def timeit(fn, n):
+    """Best-of-3 mean seconds per call."""
+    best = None
+    for _ in range(3):
+        t = time.perf_counter()
+        for _ in range(n): fn()
+        dt = (time.perf_counter() - t) / n
+        best = dt if best is None else min(best, dt)
+    return best
+
+
+def report(name, before, after):
+    print(f"{name:<28} before {before * 1e3:9.3f} ms   after {after * 1e3:9.3f} ms   x{before / after:6.1f}")
+
+
+# --- [TRIGGERS] ---
+def bench_triggers():
+    rng = random.Random(7)
+    word = lambda a, b: "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(a, b)))
+    for n in (10, 1000):
+        bot = {}
+        app.set_triggers(bot, [word(4, 10) for _ in range(n)])
+        triggers = list(bot["triggers"])
+        for length in (20, 80, 300):
+            # No trigger present: the worst case for both scans
+            msg = " ".join(word(2, 7) for _ in range(length))[:length]
+            assert app.trigger_match(bot["trigger_matcher"], msg) == any(tg in msg for tg in triggers)
+            report(f"triggers n={n} len={length}",
+                   timeit(lambda: any(tg in msg for tg in triggers), 2000),
+                   timeit(lambda: app.trigger_match(bot["trigger_matcher"], msg), 2000))
+    t = time.perf_counter()
+    app.set_triggers({}, [word(4, 10) for _ in range(1000)])
+    print(f"compile 1000 triggers: {(time.perf_counter() - t) * 1e3:.1f} ms")
+
+
+# --- [FRAMES] ---
+def recorded_frames(n=20000):
+    """A busy-room frame stream: mostly presence/typing/user-list traffic, some chat, a few joins."""
+    rng = random.Random(11)
+    users = [f"user{i}" for i in range(60)]
+    avatar = "https://cdn.example.com/avatars/{}.png"
+    frames = []
+    for i in range(n):
+        u = rng.choice(users)
+        r = rng.random()
+        if r < 0.30: f = {"handler": "room_event", "type": "text", "nickname": u, "avatar_url": avatar.format(u),
+                          "body": rng.choice(["hi titan", "lol", "anyone here?", "!id", "مرحبا habibi ✨", "gg " * 20]), "id": str(i)}
+        elif r < 0.35: f = {"handler": "room_event", "type": "join", "nickname": u, "avatar_url": avatar.format(u), "id": str(i)}
+        elif r < 0.55: f = {"handler": "room_event", "type": "leave", "nickname": u, "id": str(i)}
+        elif r < 0.75: f = {"handler": "room_event", "type": "typing", "nickname": u, "id": str(i)}
+        elif r < 0.90: f = {"handler": "presence_event", "users": [{"nickname": x, "avatar_url": avatar.format(x)} for x in rng.sample(users, 8)]}
+        else: f = {"handler": "pong"}
+        frames.append(json.dumps(f))
+    return frames
+
+
+def bench_frames():
+    frames = recorded_frames()
+    bot = app.new_bot_state("titan", "x", "lobby", "", "thread")
+    quiet, app.log = app.log, lambda *a, **k: None   # Keep console I/O out of the measurement
+    try:
+        def replay(): return [app.parse_socket_event(bot, f) for f in frames]
+        fast = replay()
+        new = (app.json_decode, app.WS_PREFILTER)
+        app.json_decode, app.WS_PREFILTER = json.loads, False
+        slow = replay()
+        assert fast == slow, "pipelines disagree"
+        before = timeit(replay, 3)
+        app.json_decode, app.WS_PREFILTER = new
+        after = timeit(replay, 3)
+        print(f"backend={app.JSON_BACKEND}  frames={len(frames)}  skipped={sum(e is None for e in fast)}")
+        report("replay inbound stream", before, after)
+        packet = app.build_room_message(bot, "مرحبا habibi ✨ " * 4, "text")
+        report("encode room_message", timeit(lambda: json.dumps(packet), 20000), timeit(lambda: app.json_encode(packet), 20000))
+    finally:
+        app.log = quiet
+
+
+# --- [PACKET IDS] ---
+def legacy_gen_random_string(length=20):
+    """The original per-char random.choice id, kept here as the reference."""
+    chars = string.ascii_lowercase + string.digits
+    return ''.join(random.choice(chars) for _ in range(length))
+
+
+def bench_packet_ids():
+    n = 50000
+    before = timeit(legacy_gen_random_string, n)
+    report("packet id (urandom pool)", before, timeit(lambda: app._pooled_id(20), n))
+    report("packet id (counter)", before, timeit(lambda: app._counter_id(20), n))
+    # Where an id sits among the rest of send_ws_msg's per-packet work
+    bot = app.new_bot_state("titan", "x", "lobby", "", "thread")
+    box = app.outbox_for(bot)   # Never joined, so the writer only queues
+    packet = app.build_room_message(bot, "hi habibi ✨", "text")
+    def enqueue():
+        app.outbox_send(bot, "hi habibi ✨")
+        box["heap"].clear()
+    try:
+        for name, fn in (("legacy id", legacy_gen_random_string), ("packet id", app.gen_random_string),
+                         ("build_room_message", lambda: app.build_room_message(bot, "hi habibi ✨", "text")),
+                         ("json_encode", lambda: app.json_encode(packet)), ("outbox_send (enqueue)", enqueue)):
+            print(f"{name:<28} {timeit(fn, n) * 1e6:8.2f} us/packet")
+    finally:
+        app.outbox_close(bot["id"])
+
+
+BENCHES = {"triggers": bench_triggers, "frames": bench_frames, "ids": bench_packet_ids}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHES:
+        BENCHES[name]()
@@ -0,0 +1,61 @@
+"""
+Shared fixtures. The app is imported as a secondary process (TITAN_MAIN_PID
+set to another pid), so no DB start-up runs, and DB connections are refused
+outright: nothing here may reach the configured database.
+"""
+import asyncio
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+os.environ["TITAN_MAIN_PID"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as titan  # noqa: E402
+
+titan.DB_URL = "postgresql://offline.invalid/titan"
+titan.get_db_connection = lambda: None
+titan.asyncpg = None
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def stub_server():
+    """
+    Starts aiohttp stand-ins on a private event loop thread.
+    Call it with a list of (method, path, handler); it returns the base URL.
+    """
+    web = pytest.importorskip("aiohttp.web")
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    runners = []
+
+    def start(routes):
+        async def boot():
+            application = web.Application()
+            for method, path, handler in routes: application.router.add_route(method, path, handler)
+            runner = web.AppRunner(application, shutdown_timeout=1)  # Don't wait on open websockets
+            await runner.setup()
+            port = free_port()
+            await web.TCPSite(runner, "127.0.0.1", port).start()
+            runners.append(runner)
+            return f"127.0.0.1:{port}"
+        return asyncio.run_coroutine_threadsafe(boot(), loop).result(10)
+
+    start.loop = loop
+    yield start
+    for runner in runners: asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+@pytest.fixture
+def bot():
+    return titan.new_bot_state("titanbot", "pw", "lobby", "http://localhost/", "thread")
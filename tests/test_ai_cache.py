@@ -0,0 +1,46 @@
+"""AI reply cache: only replies to prompts with nothing user- or room-specific are shared."""
+import time
+
+import pytest
+
+from conftest import titan
+
+
+@pytest.fixture
+def groq(monkeypatch):
+    calls = []
+    memory = {"alice": [("h1", "alice is a nurse in Cairo", 0, time.time())]}
+    monkeypatch.setattr(titan, "GROQ_API_KEY", "test")
+    monkeypatch.setattr(titan, "AI_CACHE_VARIANTS", 1)
+    monkeypatch.setitem(titan.AI_REPLY_CACHE, "data", type(titan.AI_REPLY_CACHE["data"])())
+    monkeypatch.setattr(titan, "db_get_memory", lambda user: (memory.get(user, []), "female", 10))
+    monkeypatch.setattr(titan, "db_update_memory", lambda *a, **kw: None)
+    monkeypatch.setattr(titan, "record_ai_usage", lambda *a, **kw: None)
+
+    def complete(bot, headers, payload):
+        calls.append(payload)
+        return "heyy how is work going", None, True
+
+    monkeypatch.setattr(titan, "groq_complete", complete)
+    return calls
+
+
+def test_reply_to_a_prompt_with_facts_is_not_shared(bot, groq):
+    titan.groq_ai_engine(bot, "alice", "titan hi")
+    assert "nurse" in groq[0]["messages"][0]["content"]
+    quiet = titan.new_bot_state("titanbot", "pw", "lobby", "http://localhost/", "thread")  # Same key, no context
+    titan.groq_ai_engine(quiet, "bob", "titan hi")
+    assert len(groq) == 2
+
+
+def test_reply_with_room_context_is_not_shared(bot, groq):
+    titan.context_append(bot, "user", "carol: my cat died today")
+    titan.groq_ai_engine(bot, "bob", "titan hi")
+    titan.groq_ai_engine(bot, "dave", "titan hi")
+    assert len(groq) == 2
+
+
+def test_plain_prompt_in_a_quiet_room_is_shared(bot, groq):
+    titan.groq_ai_engine(bot, "bob", "titan hi")
+    assert titan.groq_ai_engine(bot, "dave", "titan hi") == "heyy how is work going"
+    assert len(groq) == 1
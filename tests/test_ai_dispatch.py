@@ -0,0 +1,42 @@
+"""AI dispatcher: lone mentions go straight out, bursts share one completion."""
+import time
+
+import pytest
+
+from conftest import titan
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    calls = []
+    monkeypatch.setattr(titan, "AI_BATCH_WINDOW", 0.3)
+    monkeypatch.setattr(titan, "groq_ai_engine", lambda bot, user, msg: calls.append(("single", user)) or "hey")
+    monkeypatch.setattr(titan, "groq_ai_engine_batch",
+                        lambda bot, items: calls.append(("batch", [u for u, _, _ in items])) or "hey all")
+    monkeypatch.setattr(titan, "send_ws_msg", lambda bot, text, *a, **kw: None)
+    for field in ("buckets", "batches", "last_mention"): monkeypatch.setitem(titan.AI_DISPATCH, field, {})
+    return calls
+
+
+def test_lone_mention_is_not_delayed(bot, engines):
+    started = time.time()
+    titan.ai_dispatch(bot, "alice", "titan hi")
+    assert engines == [("single", "alice")]
+    assert time.time() - started < 0.1
+
+
+def test_burst_is_answered_once_without_holding_the_caller(bot, engines):
+    titan.ai_dispatch(bot, "alice", "titan hi")
+    started = time.time()
+    titan.ai_dispatch(bot, "bob", "titan yo")
+    titan.ai_dispatch(bot, "carol", "titan sup")
+    assert time.time() - started < 0.1
+    assert engines == [("single", "alice")]
+    time.sleep(0.6)
+    assert engines == [("single", "alice"), ("batch", ["bob", "carol"])]
+    assert not titan.AI_DISPATCH["inflight"]
+
+
+def test_batch_reply_tags_match_whole_names(bot):
+    assert titan.finish_batch_reply(bot, ["al"], "hi @alice", False) == "@al hi @alice"
+    assert titan.finish_batch_reply(bot, ["al"], "hi @AL!", False) == "hi @AL!"
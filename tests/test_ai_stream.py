@@ -0,0 +1,134 @@
+"""Streaming Groq replies: early cut, latency budget and the single-shot path, against a local SSE stub."""
+import asyncio
+import json
+import time
+
+import pytest
+
+from conftest import titan
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+
+
+def groq_stub(chunks, delay=0.05, hang=0, reply="hey bestie ✨"):
+    """An OpenAI-compatible endpoint: streams `chunks` `delay` apart, then stalls `hang` seconds before [DONE]."""
+    calls = []
+
+    async def handler(request):
+        body = await request.json()
+        calls.append(body)
+        if not body.get("stream"):
+            await asyncio.sleep(hang)
+            return web.json_response({"choices": [{"message": {"content": reply}}], "usage": {"completion_tokens": 4}})
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        try:
+            for chunk in chunks:
+                await resp.write(f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]})}\n\n".encode())
+                await asyncio.sleep(delay)
+            await asyncio.sleep(hang)
+            await resp.write(b"data: [DONE]\n\n")
+        except ConnectionResetError:
+            calls.append("cancelled")
+        return resp
+
+    return handler, calls
+
+
+@pytest.fixture(params=["thread", "asyncio"])
+def complete(request, monkeypatch, bot):
+    """groq_complete for the runtime under test, as a plain blocking call."""
+    monkeypatch.setattr(titan, "AI_STREAM", True)
+    monkeypatch.setattr(titan, "AI_LATENCY_BUDGET", 3)
+    payload = {"model": "test", "messages": []}
+    if request.param == "thread":
+        return lambda: titan.groq_complete(bot, {}, payload)
+    titan.async_runtime_start()
+    return lambda: titan.run_async(titan.groq_complete_async(bot, {}, payload)).result(10)
+
+
+def use(stub_server, monkeypatch, handler):
+    monkeypatch.setattr(titan, "GROQ_API_URL", f"http://{stub_server([('POST', '/groq', handler)])}/groq")
+
+
+def test_cut_at_first_sentence_and_drop_the_rest(stub_server, monkeypatch, complete):
+    handler, calls = groq_stub(["Wallah habibi ", "that is so cute! ", "✨ ", "Tell me ", "more about it."], hang=5)
+    use(stub_server, monkeypatch, handler)
+    started = time.time()
+    text, _, on_time = complete()
+    assert on_time and text == "Wallah habibi that is so cute! ✨"
+    assert time.time() - started < 2  # Did not wait for the stalled tail
+    time.sleep(0.3)
+    assert calls[-1] == "cancelled"
+
+
+def test_decimals_and_domains_do_not_end_a_sentence(stub_server, monkeypatch, complete):
+    handler, _ = groq_stub(["Wallah habibi 3.", "5 is great, ", "check google.", "com now. ", "Bye"])
+    use(stub_server, monkeypatch, handler)
+    assert complete()[0] == "Wallah habibi 3.5 is great, check google.com now."
+
+
+def test_word_limit_cut(stub_server, monkeypatch, complete):
+    monkeypatch.setattr(titan, "AI_STREAM_MAX_WORDS", 5)
+    handler, _ = groq_stub([f"w{i} " for i in range(20)], delay=0.01)
+    use(stub_server, monkeypatch, handler)
+    assert complete()[0] == "w0 w1 w2 w3 w4"
+
+
+def test_memory_replies_are_never_cut(stub_server, monkeypatch, complete):
+    monkeypatch.setattr(titan, "AI_STREAM_MAX_WORDS", 5)
+    handler, _ = groq_stub(["MEMORY", "_SAVE: ", "lives in Cairo. ", "Has two cats and a very loud parrot named Zizo."], delay=0.01)
+    use(stub_server, monkeypatch, handler)
+    assert complete()[0] == "MEMORY_SAVE: lives in Cairo. Has two cats and a very loud parrot named Zizo."
+
+
+def test_budget_sends_usable_partial(stub_server, monkeypatch, complete):
+    monkeypatch.setattr(titan, "AI_LATENCY_BUDGET", 0.8)
+    handler, _ = groq_stub(["so ", "the thing ", "is that ", "you"], delay=0.05, hang=5)
+    use(stub_server, monkeypatch, handler)
+    before = titan.AI_USAGE["budget_fallbacks"]
+    text, _, on_time = complete()
+    assert not on_time and text == "so the thing is that…"
+    assert titan.AI_USAGE["budget_fallbacks"] == before + 1
+
+
+def test_budget_falls_back_to_canned_line(stub_server, monkeypatch, complete, bot):
+    monkeypatch.setattr(titan, "AI_LATENCY_BUDGET", 0.5)
+    handler, _ = groq_stub(["hm"], hang=5)
+    use(stub_server, monkeypatch, handler)
+    started = time.time()
+    text, _, on_time = complete()
+    assert not on_time and text in titan.CANNED_REPLIES[bot["mode"]]
+    assert time.time() - started < 1.5
+
+
+def test_single_shot_when_streaming_is_off(stub_server, monkeypatch, complete):
+    monkeypatch.setattr(titan, "AI_STREAM", False)
+    handler, calls = groq_stub([], hang=0.1, reply="Hello there. More text.")
+    use(stub_server, monkeypatch, handler)
+    assert complete()[0] == "Hello there. More text."
+    assert "stream" not in calls[0]
+
+
+def test_single_shot_budget_is_a_hard_limit(stub_server, monkeypatch, complete, bot):
+    monkeypatch.setattr(titan, "AI_STREAM", False)
+    monkeypatch.setattr(titan, "AI_LATENCY_BUDGET", 0.8)
+
+    async def trickle(request):
+        # Each byte arrives well inside a per-read timeout; the whole body takes 4s
+        resp = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await resp.prepare(request)
+        try:
+            for ch in json.dumps({"choices": [{"message": {"content": "late"}}]})[:20]:
+                await resp.write(ch.encode())
+                await asyncio.sleep(0.2)
+        except ConnectionResetError:
+            pass
+        return resp
+
+    use(stub_server, monkeypatch, trickle)
+    started = time.time()
+    text, _, on_time = complete()
+    assert not on_time and text in titan.CANNED_REPLIES[bot["mode"]]
+    assert time.time() - started < 1.5
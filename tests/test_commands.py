@@ -0,0 +1,39 @@
+"""Command router: glued arguments, cooldowns and trigger edits."""
+import threading
+import time
+
+import pytest
+
+from conftest import titan
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    out = []
+    monkeypatch.setattr(titan, "send_ws_msg", lambda bot, text, *a, **kw: out.append(text))
+    monkeypatch.setattr(titan, "send_card_msg", lambda bot, text, kind, **kw: out.append((kind, kw.get("username"))))
+    monkeypatch.setattr(titan, "save_triggers", lambda bot: None)
+    monkeypatch.setitem(titan.COMMAND_STATE, "last", {})
+    return out
+
+
+def test_glued_target_is_still_a_command(bot, sent):
+    assert titan.process_room_command(bot, "alice", "!id@Bob")
+    assert sent == [("id", "bob")]
+
+
+def test_malformed_use_does_not_start_the_cooldown(bot, sent):
+    assert titan.process_room_command(bot, "alice", "!mg")
+    assert sent[-1].startswith("❌ Usage")
+    assert titan.process_room_command(bot, "alice", "!mg http://img.test/a.png hi")
+    assert sent[-1] == ("greet", "alice")
+
+
+def test_concurrent_trigger_edits_are_not_lost(bot, sent, monkeypatch):
+    compile_triggers = titan.compile_triggers
+    monkeypatch.setattr(titan, "compile_triggers", lambda words: time.sleep(0.001) or compile_triggers(words))
+    words = [f"word{i}" for i in range(40)]
+    threads = [threading.Thread(target=titan.process_room_command, args=(bot, "alice", f"!addtg {w}")) for w in words]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert bot["triggers"] == frozenset(words)
@@ -0,0 +1,42 @@
+"""Disk tier of fetch_image_bytes: revalidation and recovery from a lost data file."""
+import os
+
+import pytest
+
+from conftest import titan
+
+BODY = b"\x89PNG-not-really" * 64
+
+
+@pytest.fixture
+def origin(stub_server, tmp_path, monkeypatch):
+    web = pytest.importorskip("aiohttp.web")
+    hits = []
+
+    async def image(request):
+        conditional = "If-None-Match" in request.headers
+        hits.append(conditional)
+        if conditional and request.headers["If-None-Match"] == '"v1"': return web.Response(status=304)
+        return web.Response(body=BODY, headers={"ETag": '"v1"'})
+
+    monkeypatch.setattr(titan, "IMAGE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(titan, "IMAGE_REVALIDATE_AFTER", 0)
+    url = f"http://{stub_server([('GET', '/a.png', image)])}/a.png"
+    return url, hits
+
+
+def test_revalidated_copy_keeps_its_validators(origin):
+    url, hits = origin
+    assert titan.fetch_image_bytes(url) == BODY
+    assert titan.fetch_image_bytes(url) == BODY
+    assert titan.fetch_image_bytes(url) == BODY
+    assert hits == [False, True, True]  # The etag survives the 304 rewrite of the meta file
+
+
+def test_missing_data_file_is_refetched(origin):
+    url, hits = origin
+    titan.fetch_image_bytes(url)
+    os.unlink(titan._image_disk_paths(url)[0])
+    assert titan.fetch_image_bytes(url) == BODY
+    assert hits == [False, True, False]
+    assert not [n for n in os.listdir(os.path.dirname(titan._image_disk_paths(url)[0])) if n.endswith(".tmp")]
@@ -0,0 +1,138 @@
+"""Tunnel supervisor against a local stand-in ChatP server: drops, missed pongs, denied logins, replayed sends."""
+import asyncio
+import json
+import time
+
+import pytest
+
+from conftest import titan
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+
+
+class ChatP:
+    """Minimal ChatP websocket: answers login, records every frame, and can drop, refuse or go silent."""
+
+    def __init__(self, stub_server):
+        self.received, self.conns = [], []
+        self.deny = self.refuse = self.ignore_pings = False
+        self.loop = stub_server.loop
+        self.url = f"ws://{stub_server([('GET', '/server', self.handle)])}/server"
+
+    async def handle(self, request):
+        if self.refuse: return web.Response(status=503)
+        ws = web.WebSocketResponse(autoping=not self.ignore_pings)
+        await ws.prepare(request)
+        self.conns.append(ws)
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT: continue
+            frame = json.loads(msg.data)
+            self.received.append(frame)
+            if frame["handler"] == "login":
+                reply = {"handler": "login_event", "type": "fail", "reason": "bad password"} if self.deny \
+                    else {"handler": "login_event", "type": "success"}
+                await ws.send_str(json.dumps(reply))
+        return ws
+
+    def drop_all(self):
+        for ws in self.conns: asyncio.run_coroutine_threadsafe(ws.close(), self.loop).result(5)
+        self.conns.clear()
+
+    def count(self, handler, **fields):
+        return sum(1 for f in self.received if f["handler"] == handler and all(f.get(k) == v for k, v in fields.items()))
+
+
+def wait_for(cond, timeout=8):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if cond(): return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture(params=["thread", "asyncio"])
+def session(request, stub_server, monkeypatch):
+    """Starts a session for the runtime under test against a fresh ChatP stand-in; yields (bot, server)."""
+    server = ChatP(stub_server)
+    for name, value in {"CHATP_WS_URL": server.url, "BRIDGE_RUNTIME": request.param, "CARD_PRERENDER_INTERVAL": 0,
+                        "WS_RECONNECT_BASE": 0.05, "WS_RECONNECT_MAX": 0.2, "OUTBOX_RATE": 50.0}.items():
+        monkeypatch.setattr(titan, name, value)
+    started = []
+
+    def start():
+        bot, status = titan.start_bot_session("titanbot", "pw", f"lobby-{request.param}", "http://localhost/")
+        assert status == "BOOTING..."
+        started.append(bot)
+        return bot
+
+    yield start, server
+    for bot in started: titan.stop_bot_session(bot["id"])
+    server.drop_all()
+
+
+def test_reconnects_after_drop_and_records_metrics(session):
+    start, server = session
+    bot = start()
+    assert wait_for(lambda: bot["joined"])
+    server.drop_all()
+    assert wait_for(lambda: server.count("room_join") == 2 and bot["joined"])
+    assert server.count("login") == 2
+    stats = titan.link_stats(bot)
+    assert stats["connects"] == 2 and stats["reconnects"] == 1 and stats["drops"] == 1
+    assert stats["recover_ms_last"] is not None and stats["recover_ms_avg"] == stats["recover_ms_last"]
+
+
+def test_messages_queued_while_down_go_out_after_rejoin(session):
+    start, server = session
+    bot = start()
+    assert wait_for(lambda: bot["joined"])
+    server.refuse = True
+    server.drop_all()
+    assert wait_for(lambda: not bot["joined"])
+    sent = titan.send_ws_msg(bot, "still here ✨")
+    time.sleep(0.5)
+    assert server.count("room_message", body="still here ✨") == 0 and bot["reconnect_attempts"] >= 1
+    server.refuse = False
+    assert sent.result(10) is True
+    assert server.count("room_message", body="still here ✨") == 1
+    assert titan.link_stats(bot)["reconnects"] == 1
+
+
+def test_missed_pong_drops_the_link(session, monkeypatch):
+    start, server = session
+    monkeypatch.setattr(titan, "WS_PING_INTERVAL", 0.4)
+    monkeypatch.setattr(titan, "WS_PONG_TIMEOUT", 0.2)
+    server.ignore_pings = True
+    bot = start()
+    assert wait_for(lambda: titan.link_stats(bot)["drops"] >= 1)
+    server.ignore_pings = False
+    assert wait_for(lambda: bot["joined"] and titan.link_stats(bot)["reconnects"] >= 1)
+
+
+def test_denied_login_stops_supervision(session):
+    start, server = session
+    server.deny = True
+    bot = start()
+    assert wait_for(lambda: not bot["active"])
+    time.sleep(0.5)
+    assert server.count("login") == 1 and server.count("room_join") == 0
+    assert titan.link_stats(bot)["auth_denied"] == "bad password"
+
+
+def test_stop_during_backoff_does_not_reconnect(session, monkeypatch):
+    start, server = session
+    monkeypatch.setattr(titan, "WS_RECONNECT_BASE", 1.0)
+    bot = start()
+    assert wait_for(lambda: bot["joined"])
+    server.drop_all()
+    assert wait_for(lambda: bot["reconnect_attempts"] == 1)
+    titan.stop_bot_session(bot["id"])
+    time.sleep(1.5)
+    assert server.count("login") == 1 and not server.conns
+
+
+def test_bad_keepalive_config_is_clamped():
+    assert titan.ws_keepalive_settings(25, 10) == (25, 10)
+    assert titan.ws_keepalive_settings(10, 30) == (10, 5)
+    assert titan.ws_keepalive_settings(0, 0) == (25.0, 12.5)